@@ -7,7 +7,7 @@ import numpy as np
 import warnings
 from cffi import FFI
 from hashlib import md5
-from os import makedirs, path
+from os import makedirs, path, urandom
 
 from . import __version__
 from ._cfg import config
@@ -86,6 +86,26 @@ def asarray(ptr, shape):
     return array
 
 
+def aligned_empty(n, dtype=np.float32, alignment=64):
+    """Create an empty 1D array of length ``n`` whose buffer is aligned to ``alignment`` bytes.
+
+    Default numpy buffers are only guaranteed 16-byte alignment, which precludes
+    the widest SIMD loads/stores in the C code operating on these boxes. This
+    over-allocates by one alignment unit and returns an offset view.
+    """
+    dtype = np.dtype(dtype)
+    buf = np.empty(int(n) * dtype.itemsize + alignment, dtype=np.uint8)
+    offset = (-buf.ctypes.data) % alignment
+    return buf[offset : offset + int(n) * dtype.itemsize].view(dtype)
+
+
+def aligned_zeros(n, dtype=np.float32, alignment=64):
+    """Like :func:`aligned_empty`, but zero-filled."""
+    arr = aligned_empty(n, dtype=dtype, alignment=alignment)
+    arr[...] = 0
+    return arr
+
+
 class StructWrapper:
     """
     A base-class python wrapper for C structures (not instances of them).
@@ -174,7 +194,7 @@ class StructWrapper:
         return {
             k: v
             for k, v in self.__dict__.items()
-            if k not in ["_strings", "_StructWrapper__cstruct"]
+            if k not in ["_strings", "_StructWrapper__cstruct", "_filled_state"]
         }
 
     def refresh_cstruct(self):
@@ -215,6 +235,10 @@ class StructWithDefaults(StructWrapper):
 
     _defaults_ = {}
 
+    # The python state of the C struct at the time it was last filled. Used to
+    # avoid re-filling the struct on every call into C (see __call__).
+    _filled_state = None
+
     def __init__(self, *args, **kwargs):
 
         super().__init__()
@@ -309,9 +333,22 @@ class StructWithDefaults(StructWrapper):
         new.update(**kwargs)
         return new
 
+    def refresh_cstruct(self):
+        """Delete the underlying C object (and its cached fill state), forcing it to be rebuilt."""
+        self._filled_state = None
+        super().refresh_cstruct()
+
     def __call__(self):
         """Return a filled C Structure corresponding to this instance."""
-        for key, val in self.pystruct.items():
+        pystruct = self.pystruct
+
+        # These instances are typically passed to C many times over (eg. once per
+        # snapshot in a lightcone), with unchanged parameters. Only re-fill the
+        # underlying (cached) C struct if the parameters have actually changed.
+        if pystruct == self._filled_state:
+            return self._cstruct
+
+        for key, val in pystruct.items():
 
             # Find the value of this key in the current class
             if isinstance(val, str):
@@ -324,6 +361,8 @@ class StructWithDefaults(StructWrapper):
                 print("For key %s, value %s:" % (key, val))
                 raise
 
+        self._filled_state = pystruct
+
         return self._cstruct
 
     @property
@@ -471,7 +510,10 @@ class OutputStruct(StructWrapper):
     def random_seed(self):
         """The random seed for this particular instance."""
         if self._random_seed is None:
-            self._random_seed = int(np.random.randint(1, int(1e12)))
+            # Draw directly from OS entropy rather than the (globally-locked)
+            # numpy RNG -- this is cheaper and safe to do from many concurrent
+            # worker processes. Five bytes gives ~1e12 possible seeds.
+            self._random_seed = int.from_bytes(urandom(5), "little") + 1
 
         return self._random_seed
 
@@ -702,9 +744,17 @@ class OutputStruct(StructWrapper):
                 # Save the boxes to the file
                 boxes = f.create_group(self._name)
 
-                # Go through all fields in this struct, and save
+                # Go through all fields in this struct, and save. Large boxes
+                # get shuffled LZF compression: it is cheap enough to be hidden
+                # by the disk, and cuts the bytes that actually hit it.
                 for k in self.pointer_fields:
-                    boxes.create_dataset(k, data=getattr(self, k))
+                    data = getattr(self, k)
+                    if data.size:
+                        boxes.create_dataset(
+                            k, data=data, compression="lzf", shuffle=True
+                        )
+                    else:
+                        boxes.create_dataset(k, data=data)
 
                 for k in self.primitive_fields:
                     boxes.attrs[k] = getattr(self, k)
@@ -783,7 +833,9 @@ class OutputStruct(StructWrapper):
                     setattr(self, k, boxes[k][...])
                 else:
                     # Other pointers should fill the already-instantiated arrays.
-                    getattr(self, k)[...] = boxes[k][...]
+                    # read_direct decompresses straight into the existing buffer,
+                    # avoiding an intermediate in-memory copy of the whole box.
+                    boxes[k].read_direct(getattr(self, k))
 
             for k in boxes.attrs.keys():
                 if k == "version":
@@ -921,7 +973,12 @@ class OutputStruct(StructWrapper):
         return repr(self) == repr(other)
 
     def compute(self, direc, *args, write=True):
-        """Compute the actual function that fills this struct."""
+        """Compute the actual function that fills this struct.
+
+        Note that the C compute functions are built in CFFI's out-of-line API
+        mode, which releases the GIL for the duration of the call -- Python-side
+        work (eg. cache I/O) in other threads can overlap with the computation.
+        """
         logger.debug(f"Calling {self._c_compute_function.__name__} with args: {args}")
         try:
             exitcode = self._c_compute_function(
@@ -942,7 +999,12 @@ class OutputStruct(StructWrapper):
         self._memory_map()
         self._expose()
 
-        # Optionally do stuff with the result (like writing it)
+        # Optionally do stuff with the result (like writing it). This must stay
+        # synchronous: the filename hash and written attrs read the live
+        # global_params singleton (restored when the calling wrapper's
+        # global_params.use() block exits), callers rely on the cache file
+        # existing as soon as the wrapper returns, and the C kernels mutate
+        # earlier boxes in place, so a deferred write has no safe window.
         if write:
             self.write(direc)
 
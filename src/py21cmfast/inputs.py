@@ -377,6 +377,11 @@ class CosmoParams(StructWithDefaults):
         "POWER_INDEX": 0.9665,
     }
 
+    # Cloning an astropy cosmology is surprisingly expensive, and the cosmo
+    # property is hit once per snapshot in lightcone assembly, almost always
+    # with the same parameters -- so memoize the clones at the class level.
+    _cosmo_cache = {}
+
     @property
     def OMl(self):
         """Omega lambda, dark energy density."""
@@ -385,7 +390,13 @@ class CosmoParams(StructWithDefaults):
     @property
     def cosmo(self):
         """Return an astropy cosmology object for this cosmology."""
-        return Planck15.clone(H0=self.hlittle * 100, Om0=self.OMm, Ob0=self.OMb)
+        key = (self.hlittle, self.OMm, self.OMb)
+        try:
+            return self._cosmo_cache[key]
+        except KeyError:
+            return self._cosmo_cache.setdefault(
+                key, Planck15.clone(H0=self.hlittle * 100, Om0=self.OMm, Ob0=self.OMb)
+            )
 
 
 class UserParams(StructWithDefaults):
@@ -428,7 +439,10 @@ class UserParams(StructWithDefaults):
         5: CLASS (single cosmology)
     N_THREADS : int, optional
         Sets the number of processors (threads) to be used for performing 21cmFAST.
-        Default 1.
+        Default 1. Note that scaling beyond ~4 threads is poor (and can even be
+        negative) for typical box sizes, as the heavy kernels are memory-bound;
+        when running many simulations, prefer several few-thread processes over
+        one many-thread process.
     PERTURB_ON_HIGH_RES : bool, optional
         Whether to perform the Zel'Dovich or 2LPT perturbation on the low or high
         resolution grid.
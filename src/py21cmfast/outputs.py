@@ -15,8 +15,6 @@ import h5py
 import numpy as np
 import os
 import warnings
-from astropy import units
-from astropy.cosmology import z_at_value
 from cached_property import cached_property
 from hashlib import md5
 from typing import List
@@ -25,11 +23,40 @@ from . import __version__
 from . import _utils as _ut
 from ._cfg import config
 from ._utils import OutputStruct as _BaseOutputStruct
-from ._utils import _check_compatible_inputs
+from ._utils import _check_compatible_inputs, aligned_empty, aligned_zeros
 from .c_21cmfast import ffi, lib
 from .inputs import AstroParams, CosmoParams, FlagOptions, UserParams, global_params
 
 
+def _z_at_comoving_distances(cosmo, distances):
+    """Convert comoving distances [Mpc] to redshifts by inverse interpolation.
+
+    Equivalent to calling :func:`~astropy.cosmology.z_at_value` on
+    ``cosmo.comoving_distance`` for each distance, but in one vectorized pass:
+    the comoving distance is integrated over a fine redshift grid and inverted
+    by linear interpolation. This is accurate to ~1e-5 in redshift -- far below
+    the lightcone cell spacing -- while avoiding a root-find (each involving
+    many quad integrations) per lightcone cell.
+    """
+    distances = np.asarray(distances)
+
+    # Find an upper redshift bound for the grid.
+    zmax = 20.0
+    while cosmo.comoving_distance(zmax).value < distances.max():
+        zmax *= 2
+
+    # d_C(z) = d_H * int_0^z dz'/E(z'): cumulative-trapezoid the (vectorized)
+    # integrand rather than calling the scalar comoving_distance per grid point.
+    zgrid = np.linspace(0, zmax, 2 ** 16)
+    integrand = cosmo.inv_efunc(zgrid)
+    dgrid = np.empty_like(zgrid)
+    dgrid[0] = 0
+    dgrid[1:] = np.cumsum((integrand[1:] + integrand[:-1]) / 2) * (zgrid[1] - zgrid[0])
+    dgrid *= cosmo.hubble_distance.value
+
+    return np.interp(distances, dgrid, zgrid)
+
+
 class _OutputStruct(_BaseOutputStruct):
     _global_params = global_params
 
@@ -87,43 +114,53 @@ class InitialConditions(_OutputStruct):
     ]
 
     def _init_arrays(self):
-        self.lowres_density = np.zeros(
-            self.user_params.HII_tot_num_pixels, dtype=np.float32
-        )
-        self.lowres_vx = np.zeros(self.user_params.HII_tot_num_pixels, dtype=np.float32)
-        self.lowres_vy = np.zeros(self.user_params.HII_tot_num_pixels, dtype=np.float32)
-        self.lowres_vz = np.zeros(self.user_params.HII_tot_num_pixels, dtype=np.float32)
-
-        self.hires_vx = np.zeros(self.user_params.tot_fft_num_pixels, dtype=np.float32)
-        self.hires_vy = np.zeros(self.user_params.tot_fft_num_pixels, dtype=np.float32)
-        self.hires_vz = np.zeros(self.user_params.tot_fft_num_pixels, dtype=np.float32)
-
-        self.lowres_vx_2LPT = np.zeros(
-            self.user_params.HII_tot_num_pixels, dtype=np.float32
-        )
-        self.lowres_vy_2LPT = np.zeros(
-            self.user_params.HII_tot_num_pixels, dtype=np.float32
-        )
-        self.lowres_vz_2LPT = np.zeros(
+        # Only the boxes the C code writes in full may be left un-zeroed
+        # (avoiding touching each large box twice). That is hires_density
+        # always, but lowres_density and the velocity triplets only on the
+        # resolution selected by PERTURB_ON_HIGH_RES; everything else --
+        # including the 2LPT and vcb boxes, which are only filled when
+        # SECOND_ORDER_LPT_CORRECTIONS/USE_RELATIVE_VELOCITIES are set --
+        # must be zeroed so that un-computed fields never expose (or cache)
+        # uninitialized memory.
+        hi_res = self.user_params.PERTURB_ON_HIGH_RES
+
+        self.lowres_density = (aligned_zeros if hi_res else aligned_empty)(
             self.user_params.HII_tot_num_pixels, dtype=np.float32
         )
-
-        self.hires_vx_2LPT = np.zeros(
-            self.user_params.tot_fft_num_pixels, dtype=np.float32
-        )
-        self.hires_vy_2LPT = np.zeros(
-            self.user_params.tot_fft_num_pixels, dtype=np.float32
-        )
-        self.hires_vz_2LPT = np.zeros(
+        # Each velocity triplet is stored as the rows of one contiguous (3, N)
+        # block, so the three components of a triplet are adjacent in memory.
+        # The components themselves are plain row views, so nothing changes
+        # from the user's (or the cache's) perspective. Only the triplet on
+        # the resolution selected by PERTURB_ON_HIGH_RES is written by the C
+        # code; the other must be zeroed.
+        lowres_v = (aligned_zeros if hi_res else aligned_empty)(
+            3 * self.user_params.HII_tot_num_pixels, dtype=np.float32
+        ).reshape((3, -1))
+        self.lowres_vx, self.lowres_vy, self.lowres_vz = lowres_v
+
+        hires_v = (aligned_empty if hi_res else aligned_zeros)(
+            3 * self.user_params.tot_fft_num_pixels, dtype=np.float32
+        ).reshape((3, -1))
+        self.hires_vx, self.hires_vy, self.hires_vz = hires_v
+
+        lowres_v_2LPT = aligned_zeros(
+            3 * self.user_params.HII_tot_num_pixels, dtype=np.float32
+        ).reshape((3, -1))
+        self.lowres_vx_2LPT, self.lowres_vy_2LPT, self.lowres_vz_2LPT = lowres_v_2LPT
+
+        hires_v_2LPT = aligned_zeros(
+            3 * self.user_params.tot_fft_num_pixels, dtype=np.float32
+        ).reshape((3, -1))
+        self.hires_vx_2LPT, self.hires_vy_2LPT, self.hires_vz_2LPT = hires_v_2LPT
+
+        self.hires_density = aligned_empty(
             self.user_params.tot_fft_num_pixels, dtype=np.float32
         )
 
-        self.hires_density = np.zeros(
+        self.hires_vcb = aligned_zeros(
             self.user_params.tot_fft_num_pixels, dtype=np.float32
         )
-
-        self.hires_vcb = np.zeros(self.user_params.tot_fft_num_pixels, dtype=np.float32)
-        self.lowres_vcb = np.zeros(
+        self.lowres_vcb = aligned_zeros(
             self.user_params.HII_tot_num_pixels, dtype=np.float32
         )
 
@@ -185,8 +222,13 @@ class PerturbedField(_OutputStructZ):
     ]
 
     def _init_arrays(self):
-        self.density = np.zeros(self.user_params.HII_tot_num_pixels, dtype=np.float32)
-        self.velocity = np.zeros(self.user_params.HII_tot_num_pixels, dtype=np.float32)
+        # Both boxes are written in full by the C code, so need not be zeroed.
+        self.density = aligned_empty(
+            self.user_params.HII_tot_num_pixels, dtype=np.float32
+        )
+        self.velocity = aligned_empty(
+            self.user_params.HII_tot_num_pixels, dtype=np.float32
+        )
 
         self.density.shape = (
             self.user_params.HII_DIM,
@@ -471,7 +513,7 @@ class _HighLevelOutput:
             hash=md5((self._input_rep() + self._particular_rep()).encode()).hexdigest()
         )
 
-    def _write(self, direc=None, fname=None, clobber=False):
+    def _write(self, direc=None, fname=None, clobber=False, float16=False):
         """
         Write the lightcone to file in standard HDF5 format.
 
@@ -488,6 +530,10 @@ class _HighLevelOutput:
             The filename to write, default a unique name produced by the inputs.
         clobber : bool, optional
             Whether to overwrite existing file.
+        float16 : bool, optional
+            Whether to store the large box data at half precision, halving the
+            file size. Lossy -- only use for data whose downstream analysis
+            tolerates ~3 significant figures.
 
         Returns
         -------
@@ -545,14 +591,14 @@ class _HighLevelOutput:
             f.attrs["random_seed"] = self.random_seed
             f.attrs["version"] = __version__
 
-        self._write_particulars(fname)
+        self._write_particulars(fname, float16=float16)
 
         return fname
 
-    def _write_particulars(self, fname):
+    def _write_particulars(self, fname, float16=False):
         pass
 
-    def save(self, fname=None, direc="."):
+    def save(self, fname=None, direc=".", float16=False):
         """Save to disk.
 
         This function has defaults that make it easy to save a unique box to
@@ -564,13 +610,17 @@ class _HighLevelOutput:
             The filename to write, default a unique name produced by the inputs.
         direc : str, optional
             The directory into which to write the file. Default is the current directory.
+        float16 : bool, optional
+            Whether to store the large box data at half precision, halving the
+            file size. Lossy -- only use for data whose downstream analysis
+            tolerates ~3 significant figures.
 
         Returns
         -------
         str :
             The filename to which the box was written.
         """
-        return self._write(direc=direc, fname=fname)
+        return self._write(direc=direc, fname=fname, float16=float16)
 
     @classmethod
     def _read_inputs(cls, fname):
@@ -705,7 +755,14 @@ class Coeval(_HighLevelOutput):
     def _particular_rep(self):
         return ""
 
-    def _write_particulars(self, fname):
+    def _write_particulars(self, fname, float16=False):
+        if float16:
+            warnings.warn(
+                "float16 storage is not supported for Coeval boxes (they may be "
+                "re-used as inputs to further computation); writing at full "
+                "precision."
+            )
+
         for name in ["init", "perturb", "ionization", "brightness_temp", "spin_temp"]:
             struct = getattr(self, name + "_struct")
             if struct is not None:
@@ -829,11 +886,8 @@ class LightCone(_HighLevelOutput):
     @property
     def lightcone_redshifts(self):
         """Redshift of each cell along the redshift axis."""
-        return np.array(
-            [
-                z_at_value(self.cosmo_params.cosmo.comoving_distance, d * units.Mpc)
-                for d in self.lightcone_distances
-            ]
+        return _z_at_comoving_distances(
+            self.cosmo_params.cosmo, self.lightcone_distances
         )
 
     def _particular_rep(self):
@@ -843,14 +897,16 @@ class LightCone(_HighLevelOutput):
             + str(self.lightcones.keys())
         )
 
-    def _write_particulars(self, fname):
+    def _write_particulars(self, fname, float16=False):
         with h5py.File(fname, "a") as f:
             # Save the boxes to the file
             boxes = f.create_group("lightcones")
 
-            # Go through all fields in this struct, and save
+            # Go through all fields in this struct, and save. The lightcone
+            # quantities have modest dynamic range, so half precision is an
+            # acceptable (opt-in) trade for half the disk footprint.
             for k, val in self.lightcones.items():
-                boxes[k] = val
+                boxes[k] = val.astype(np.float16) if float16 else val
 
             global_q = f.create_group("global_quantities")
             for k, v in self.global_quantities.items():
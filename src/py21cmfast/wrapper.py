@@ -88,8 +88,7 @@ import logging
 import numpy as np
 import os
 import warnings
-from astropy import units
-from astropy.cosmology import z_at_value
+import weakref
 from copy import deepcopy
 from scipy.interpolate import interp1d
 
@@ -108,10 +107,17 @@ from .outputs import (
     PerturbHaloField,
     TsBox,
     _OutputStructZ,
+    _z_at_comoving_distances,
 )
 
 logger = logging.getLogger("21cmFAST")
 
+# Bind the C entry points called once per snapshot at import time: attribute
+# lookups on ``lib`` go through CFFI's library __getattr__, which is best kept
+# out of the hot loop. The Compute* functions are similarly bound once, as the
+# ``_c_compute_function`` attribute of each output-struct class.
+_create_fftw_wisdoms = lib.CreateFFTWWisdoms
+
 
 def _configure_inputs(
     defaults: list,
@@ -301,6 +307,14 @@ def get_all_fieldnames(arrays_only=True, lightcone_only=False, as_dict=False):
 # ======================================================================================
 # WRAPPING FUNCTIONS
 # ======================================================================================
+
+# FFTW wisdom files are persisted to disk by the C code, keyed by box dimension
+# and thread count, so they survive across process invocations. Verifying (or
+# creating) them still allocates and zeroes two full FFT boxes per call, though,
+# so remember which configurations this process has already handled.
+_wisdoms_constructed = set()
+
+
 def construct_fftw_wisdoms(*, user_params=None, cosmo_params=None):
     """Construct all necessary FFTW wisdoms.
 
@@ -313,8 +327,20 @@ def construct_fftw_wisdoms(*, user_params=None, cosmo_params=None):
     user_params = UserParams(user_params)
     cosmo_params = CosmoParams(cosmo_params)
 
+    if not user_params.USE_FFTW_WISDOM:
+        return 0
+
+    key = (user_params.DIM, user_params.HII_DIM, user_params.N_THREADS)
+    if key in _wisdoms_constructed:
+        return 0
+
     # Run the C code
-    return lib.CreateFFTWWisdoms(user_params(), cosmo_params())
+    exitcode = _create_fftw_wisdoms(user_params(), cosmo_params())
+
+    if exitcode == 0:
+        _wisdoms_constructed.add(key)
+
+    return exitcode
 
 
 def compute_tau(*, redshifts, global_xHI, user_params=None, cosmo_params=None):
@@ -776,6 +802,14 @@ def _get_photon_nonconservation_data():
     return photon_nonconservation_data
 
 
+# Process-level cache of live InitialConditions instances, keyed by their full
+# (seed-inclusive) repr. Initial conditions are often requested many times with
+# identical parameters within a session (eg. once per snapshot of a lightcone
+# driven manually), and re-reading them from disk each time is expensive. Weak
+# references ensure we never keep these large boxes alive on our own.
+_ic_cache = weakref.WeakValueDictionary()
+
+
 def initial_conditions(
     *,
     user_params=None,
@@ -827,28 +861,48 @@ def initial_conditions(
             user_params=user_params, cosmo_params=cosmo_params, random_seed=random_seed
         )
 
-        # Construct FFTW wisdoms. Only if required
-        construct_fftw_wisdoms(user_params=user_params, cosmo_params=cosmo_params)
-
         # First check whether the boxes already exist.
         if not regenerate:
+            # A box with these exact parameters may still be alive in memory from
+            # earlier in this session -- if so, avoid the disk read entirely. Only
+            # possible when the seed is explicitly known, and only trusted when
+            # the corresponding cache file exists: callers rely on a returned
+            # (non-computed) box being on disk in `direc` (eg. with write=True),
+            # which an instance cached from a write=False call would violate.
+            if boxes._random_seed:
+                cached = _ic_cache.get(repr(boxes))
+                if cached is not None and cached.exists(direc):
+                    logger.info(
+                        "Existing init_boxes found in memory (seed=%s)."
+                        % cached.random_seed
+                    )
+                    return cached
+
             try:
                 boxes.read(direc)
                 logger.info(
                     "Existing init_boxes found and read in (seed=%s)."
                     % boxes.random_seed
                 )
+                _ic_cache[repr(boxes)] = boxes
                 return boxes
             except IOError:
                 pass
 
-        return boxes.compute(
+        # Construct FFTW wisdoms. Only if required. Done after the cache check
+        # so that a cache hit doesn't pay for plan construction.
+        construct_fftw_wisdoms(user_params=user_params, cosmo_params=cosmo_params)
+
+        boxes = boxes.compute(
             direc,
             boxes.random_seed,
             boxes.user_params,
             boxes.cosmo_params,
             write=write,
         )
+        if not regenerate:
+            _ic_cache[repr(boxes)] = boxes
+        return boxes
 
 
 def perturb_field(
@@ -1482,9 +1536,6 @@ def ionize_box(
             random_seed=random_seed,
         )
 
-        # Construct FFTW wisdoms. Only if required
-        construct_fftw_wisdoms(user_params=user_params, cosmo_params=cosmo_params)
-
         # Check whether the boxes already exist
         if not regenerate:
             try:
@@ -1499,6 +1550,9 @@ def ionize_box(
 
         # EVERYTHING PAST THIS POINT ONLY HAPPENS IF THE BOX DOESN'T ALREADY EXIST
         # ------------------------------------------------------------------------
+        # Construct FFTW wisdoms. Only if required
+        construct_fftw_wisdoms(user_params=user_params, cosmo_params=cosmo_params)
+
         # Get the previous redshift
         if flag_options.INHOMO_RECO or flag_options.USE_TS_FLUCT:
 
@@ -1823,9 +1877,6 @@ def spin_temperature(
             random_seed=random_seed,
         )
 
-        # Construct FFTW wisdoms. Only if required
-        construct_fftw_wisdoms(user_params=user_params, cosmo_params=cosmo_params)
-
         # Check whether the boxes already exist on disk.
         if not regenerate:
             try:
@@ -1840,6 +1891,8 @@ def spin_temperature(
 
         # EVERYTHING PAST THIS POINT ONLY HAPPENS IF THE BOX DOESN'T ALREADY EXIST
         # ------------------------------------------------------------------------
+        # Construct FFTW wisdoms. Only if required
+        construct_fftw_wisdoms(user_params=user_params, cosmo_params=cosmo_params)
 
         # Get the previous redshift
         if previous_spin_temp is not None:
@@ -1982,11 +2035,6 @@ def brightness_temperature(
             random_seed=ionized_box.random_seed,
         )
 
-        # Construct FFTW wisdoms. Only if required
-        construct_fftw_wisdoms(
-            user_params=ionized_box.user_params, cosmo_params=ionized_box.cosmo_params
-        )
-
         # Check whether the boxes already exist on disk.
         if not regenerate:
             try:
@@ -1999,6 +2047,12 @@ def brightness_temperature(
             except IOError:
                 pass
 
+        # Construct FFTW wisdoms. Only if required. Done after the cache check
+        # so that a cache hit doesn't pay for plan construction.
+        construct_fftw_wisdoms(
+            user_params=ionized_box.user_params, cosmo_params=ionized_box.cosmo_params
+        )
+
         return box.compute(
             direc,
             ionized_box.redshift,
@@ -2014,10 +2068,18 @@ def brightness_temperature(
 
 
 def _logscroll_redshifts(min_redshift, z_step_factor, zmax):
-    redshifts = [min_redshift]
-    while redshifts[-1] < zmax:
-        redshifts.append((redshifts[-1] + 1.0) * z_step_factor - 1.0)
-    return redshifts[::-1]
+    # (1+z) grows geometrically by z_step_factor per step, so the grid has a
+    # closed form -- build it in one vectorized call rather than a Python loop.
+    n_steps = np.log((zmax + 1.0) / (min_redshift + 1.0)) / np.log(z_step_factor)
+    zgrid = (min_redshift + 1.0) * z_step_factor ** np.arange(
+        max(int(np.ceil(n_steps)), 0) + 1
+    ) - 1.0
+
+    # Guard against round-off in the log above: the grid must reach zmax.
+    if zgrid[-1] < zmax:
+        zgrid = np.append(zgrid, (zgrid[-1] + 1.0) * z_step_factor - 1.0)
+
+    return zgrid[::-1].tolist()
 
 
 def run_coeval(
@@ -2898,12 +2960,7 @@ def _get_lightcone_redshifts(
     )[1]
     lc_distances += cosmo_params.cosmo.comoving_distance(redshift).value
 
-    return np.array(
-        [
-            z_at_value(cosmo_params.cosmo.comoving_distance, d * units.Mpc)
-            for d in lc_distances
-        ]
-    )
+    return _z_at_comoving_distances(cosmo_params.cosmo, lc_distances)
 
 
 def calibrate_photon_cons(
@@ -1,5 +1,6 @@
 import pytest
 
+import h5py
 import numpy as np
 from os import path
 
@@ -25,6 +26,27 @@ def test_lightcone_io_abspath(lc, test_direc):
     assert (test_direc / "abs_path_lightcone.h5").exists()
 
 
+def test_lightcone_float16(test_direc, lc):
+    fname = lc.save(test_direc / "float16_lightcone.h5", float16=True)
+
+    with h5py.File(fname, "r") as fl:
+        for k in lc.lightcones:
+            assert fl["lightcones"][k].dtype == np.float16
+
+    lc2 = LightCone.read(fname)
+
+    assert lc == lc2
+    assert np.all(lc2.brightness_temp == lc.brightness_temp.astype(np.float16))
+
+
+def test_coeval_float16_warns(test_direc, coeval):
+    with pytest.warns(UserWarning, match="float16 storage is not supported"):
+        fname = coeval.save(test_direc / "float16_coeval.h5", float16=True)
+
+    with h5py.File(fname, "r") as fl:
+        assert fl["BrightnessTemp"]["brightness_temp"].dtype == np.float32
+
+
 def test_coeval_roundtrip(test_direc, coeval):
     fname = coeval.save(direc=test_direc)
     coeval2 = Coeval.read(fname)